@@ -1,141 +1,17 @@
-from utils.file_handler import read_sales_data
-
-# Test Task 1.1: Read Sales Data Function
-print("\n" + "="*50)
-print("TESTING: read_sales_data()")
-print("="*50)
-
-raw_lines = read_sales_data('data/sales_data.txt')
-
-print(f"\nTotal lines read: {len(raw_lines)}")
-if raw_lines:
-    print(f"\nFirst 3 lines:")
-    for i, line in enumerate(raw_lines[:3]):
-        print(f"  {i+1}. {line}")
-    
-    print(f"\nLast line:")
-    print(f"  {raw_lines[-1]}")
-from utils.data_processor import parse_transactions
-
-
-# Test Task 1.2: Parse and Clean Data
-print("\n" + "="*50)
-print("TESTING: parse_transactions()")
-print("="*50)
-
-parsed_data = parse_transactions(raw_lines)
-
-print(f"\nTotal parsed: {len(parsed_data)}")
-if parsed_data:
-    print(f"\nFirst transaction:")
-    print(parsed_data[0])
-    
-    print(f"\nExample of cleaned comma data:")
-    # Find a transaction with comma in number
-    for trans in parsed_data:
-        if ',' in trans['ProductName'] or trans['UnitPrice'] > 1000:
-            print(trans)
-            break
-
-from utils.data_processor import validate_and_filter
-
-# Test Task 1.3: Validate and Filter
-print("\n" + "="*50)
-print("TESTING: validate_and_filter()")
-print("="*50)
-
-valid_trans, invalid_count, summary = validate_and_filter(parsed_data)
-
-print(f"\nFilter Summary:")
-for key, value in summary.items():
-    print(f"  {key}: {value}")
-
-from utils.data_processor import (
-    calculate_total_revenue,
-    region_wise_sales,
-    top_selling_products,
-    customer_analysis,
-    daily_sales_trend
-)
-
-# Test Question 3: Data Processing Functions
-print("\n" + "="*50)
-print("QUESTION 3: DATA PROCESSING FUNCTIONS")
-print("="*50)
-
-# Test 1: Total Revenue
-print("\n1. Calculate Total Revenue")
-total_revenue = calculate_total_revenue(valid_trans)
-print(f"   Total Revenue: ₹{total_revenue:,.2f}")
-
-# Test 2: Region-wise Sales
-print("\n2. Region-wise Sales Analysis")
-regions = region_wise_sales(valid_trans)
-for region, data in list(regions.items())[:3]:
-    print(f"   {region}: ₹{data['total_sales']:,.2f} ({data['percentage']:.2f}%) - {data['transaction_count']} txns")
-
-# Test 3: Top Selling Products
-print("\n3. Top 5 Products")
-top_products = top_selling_products(valid_trans, n=5)
-for i, (product, qty, revenue) in enumerate(top_products, 1):
-    print(f"   {i}. {product}: {qty} units, ₹{revenue:,.2f}")
-
-# Test 4: Customer Analysis
-print("\n4. Top 3 Customers")
-customers = customer_analysis(valid_trans)
-for i, (cust_id, data) in enumerate(list(customers.items())[:3], 1):
-    print(f"   {i}. {cust_id}: Spent ₹{data['total_spent']:,.2f} ({data['purchase_count']} purchases)")
-
-# Test 5: Daily Sales Trend
-print("\n5. Daily Sales Trend (First 3 days)")
-daily = daily_sales_trend(valid_trans)
-for date, data in list(daily.items())[:3]:
-    print(f"   {date}: ₹{data['revenue']:,.2f} ({data['transaction_count']} txns, {data['unique_customers']} customers)")
-
-print("\n✓ All Question 3 functions tested!")
-
-from utils.api_handler import fetch_all_products, create_product_mapping, enrich_sales_data, save_enriched_data
-
-# Test Question 4: API Integration
-print("\n" + "="*50)
-print("QUESTION 4: API INTEGRATION")
-print("="*50)
-
-# Fetch products
-api_products = fetch_all_products()
-
-if api_products:
-    # Create mapping
-    product_mapping = create_product_mapping(api_products)
-    
-    # Enrich sales data
-    enriched_trans = enrich_sales_data(valid_trans, product_mapping)
-    
-    # Save enriched data
-    save_enriched_data(enriched_trans)
-    
-    # Show sample
-    print(f"\nSample enriched transaction:")
-    if enriched_trans:
-        sample = enriched_trans[0]
-        print(f"  TransactionID: {sample['TransactionID']}")
-        print(f"  ProductName: {sample['ProductName']}")
-        print(f"  API_Brand: {sample.get('API_Brand', 'N/A')}")
-        print(f"  API_Match: {sample.get('API_Match', 'N/A')}")
-else:
-    print("✗ Failed to fetch products from API")
-
-print("\n✓ Question 4 complete!")
-
 #!/usr/bin/env python3
 """
 Sales Analytics System - Main Application
 Complete workflow for sales data processing, analysis, and reporting
 """
 
+import hashlib
+import os
+import pickle
 import sys
 from pathlib import Path
 
+import pandas as pd
+
 # Add utils to path
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -152,7 +28,40 @@ from utils.data_processor import (
     low_performing_products,
     generate_sales_report
 )
-from utils.api_handler import fetch_all_products, create_product_mapping, enrich_sales_data, save_enriched_data
+from utils.api_handler import fetch_all_products, enrich_and_save_chunks
+
+# Parsed transactions are memoized here, keyed on the source file's
+# identity, so unchanged data files skip the read+parse steps entirely
+PARSE_CACHE_DIR = Path('data/.parse_cache')
+
+# Bump when the parsed record layout changes, so stale caches miss
+PARSE_CACHE_VERSION = 2
+
+
+def _parse_cache_path(filename):
+    """Cache file for filename, keyed by its path, mtime and size"""
+    stat = os.stat(filename)
+    key = f'v{PARSE_CACHE_VERSION}|{Path(filename).resolve()}|{stat.st_mtime_ns}|{stat.st_size}'
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return PARSE_CACHE_DIR / f'{digest}.pkl'
+
+
+def _load_parsed_cache(cache_file):
+    """Returns the cached parsed transactions, or None on any miss"""
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.PickleError, EOFError):
+        return None
+
+
+def _save_parsed_cache(cache_file, transactions):
+    try:
+        PARSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(cache_file, 'wb') as f:
+            pickle.dump(transactions, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        print(f"⚠ Could not write parse cache: {str(e)}")
 
 
 def main():
@@ -182,29 +91,46 @@ def main():
         print("=" * 50)
         print()
         
-        # Step 1: Read sales data
+        # Step 1: Read sales data (or reuse the parse cache)
         print("[1/10] Reading sales data...")
-        raw_lines = read_sales_data('data/sales_data.txt')
-        print(f"✓ Successfully read {len(raw_lines)} transactions")
-        print()
-        
-        # Step 2: Parse and clean data
-        print("[2/10] Parsing and cleaning data...")
-        transactions = parse_transactions(raw_lines)
-        print(f"✓ Parsed {len(transactions)} records")
-        print()
+        data_file = 'data/sales_data.txt'
+
+        try:
+            cache_file = _parse_cache_path(data_file)
+        except OSError:
+            cache_file = None
+
+        transactions = _load_parsed_cache(cache_file) if cache_file else None
+
+        if transactions is not None:
+            print(f"✓ Loaded {len(transactions)} parsed records from cache")
+            print()
+        else:
+            raw_lines = read_sales_data(data_file)
+            print(f"✓ Successfully read {len(raw_lines)} transactions")
+            print()
+
+            # Step 2: Parse and clean data
+            print("[2/10] Parsing and cleaning data...")
+            transactions = parse_transactions(raw_lines)
+            if cache_file:
+                _save_parsed_cache(cache_file, transactions)
+            print(f"✓ Parsed {len(transactions)} records")
+            print()
         
         # Step 3: Display filter options
         print("[3/10] Filter Options Available:")
-        
-        # Get regions
-        regions = sorted(set(t['Region'] for t in transactions))
+
+        # One columnar pass over a DataFrame instead of several Python
+        # scans for regions, amounts and min/max
+        df = pd.DataFrame(transactions)
+        amounts = df['Amount'] if not df.empty else pd.Series(dtype=float)
+
+        regions = sorted(df['Region'].unique()) if not df.empty else []
         print(f"Regions: {', '.join(regions)}")
-        
-        # Get amount range
-        amounts = [t['Quantity'] * t['UnitPrice'] for t in transactions]
-        min_amount = min(amounts) if amounts else 0
-        max_amount = max(amounts) if amounts else 0
+
+        min_amount = float(amounts.min()) if len(amounts) else 0
+        max_amount = float(amounts.max()) if len(amounts) else 0
         print(f"Amount Range: ₹{min_amount:,.0f} - ₹{max_amount:,.0f}")
         print()
         
@@ -220,27 +146,25 @@ def main():
             print("3. Both")
             print()
             
-            filtered_transactions = transactions.copy()
-            
+            # Filters combine into one boolean mask over the DataFrame
+            mask = pd.Series(True, index=df.index)
+
             filter_type = input("Choose filter type (1/2/3): ").strip()
-            
+
             if filter_type in ['1', '3']:
                 region_input = input(f"Enter region ({', '.join(regions)}): ").strip()
                 if region_input in regions:
-                    filtered_transactions = [t for t in filtered_transactions if t['Region'] == region_input]
-            
+                    mask &= df['Region'].eq(region_input)
+
             if filter_type in ['2', '3']:
                 try:
                     min_val = float(input(f"Enter minimum amount (₹{min_amount:,.0f}): ").strip() or min_amount)
                     max_val = float(input(f"Enter maximum amount (₹{max_amount:,.0f}): ").strip() or max_amount)
-                    filtered_transactions = [
-                        t for t in filtered_transactions 
-                        if min_val <= t['Quantity'] * t['UnitPrice'] <= max_val
-                    ]
+                    mask &= amounts.between(min_val, max_val)
                 except ValueError:
                     print("Invalid amount entered. Using all data.")
-            
-            transactions = filtered_transactions
+
+            transactions = df[mask].to_dict('records')
             print(f"✓ Filtered to {len(transactions)} records")
         
         print()
@@ -276,36 +200,34 @@ def main():
         print(f"✓ Analysis complete")
         print()
         
-        # Step 7: Fetch products from API
+        # Step 7: Fetch products from API (returns the ID -> info mapping)
         print("[6/10] Fetching product data from API...")
-        api_products = fetch_all_products()
-        if api_products:
-            print(f"✓ Fetched {len(api_products)} products")
+        product_mapping = fetch_all_products()
+        if product_mapping:
+            print(f"✓ Fetched {len(product_mapping)} products")
         else:
             print("✗ Failed to fetch products from API")
-            api_products = []
+            product_mapping = {}
         print()
-        
-        # Step 8: Create product mapping and enrich data
+
+        # Steps 8-9: Enrich data and stream it to disk chunk by chunk,
+        # accumulating the API stats for the report along the way
         print("[7/10] Enriching sales data...")
-        product_mapping = create_product_mapping(api_products)
-        enriched_transactions = enrich_sales_data(valid_transactions, product_mapping)
-        
-        # Count enriched transactions
-        enriched_count = sum(1 for t in enriched_transactions if t.get('API_Match', False))
-        success_rate = (enriched_count / len(enriched_transactions) * 100) if enriched_transactions else 0
-        print(f"✓ Enriched {enriched_count}/{len(enriched_transactions)} transactions ({success_rate:.1f}%)")
+        api_summary = enrich_and_save_chunks(valid_transactions, product_mapping,
+                                             'data/enriched_sales_data.txt')
+
+        enriched_count = api_summary['matched']
+        success_rate = (enriched_count / api_summary['total'] * 100) if api_summary['total'] else 0
+        print(f"✓ Enriched {enriched_count}/{api_summary['total']} transactions ({success_rate:.1f}%)")
         print()
-        
-        # Step 9: Save enriched data
+
         print("[8/10] Saving enriched data...")
-        save_enriched_data(enriched_transactions, 'data/enriched_sales_data.txt')
         print(f"✓ Saved to: data/enriched_sales_data.txt")
         print()
-        
+
         # Step 10: Generate report
         print("[9/10] Generating report...")
-        generate_sales_report(valid_transactions, enriched_transactions, 'output/sales_report.txt')
+        generate_sales_report(valid_transactions, api_summary, 'output/sales_report.txt')
         print(f"✓ Report saved to: output/sales_report.txt")
         print()
         
@@ -1,672 +1,729 @@
-def parse_transactions(raw_lines):
-    """
-    Parses raw lines into clean list of dictionaries
-    
-    Returns: list of dictionaries with 8 keys:
-    ['TransactionID', 'Date', 'ProductID', 'ProductName', 
-     'Quantity', 'UnitPrice', 'CustomerID', 'Region']
-    
-    Expected Output Format:
-    [
-        {
-            'TransactionID': 'T001',
-            'Date': '2024-12-01',
-            'ProductID': 'P101',
-            'ProductName': 'Laptop',
-            'Quantity': 2,
-            'UnitPrice': 45000.0,
-            'CustomerID': 'C001',
-            'Region': 'North'
-        },
-        ...
-    ]
-    
-    Requirements:
-    - Split by pipe delimiter '|'
-    - Handle commas within ProductName (remove or replace)
-    - Remove commas from numeric fields and convert to proper types
-    - Convert Quantity to int
-    - Convert UnitPrice to float
-    - Skip rows with incorrect number of fields
-    """
-    
-    transactions = []
-    skipped = 0
-    
-    for line in raw_lines:
-        try:
-            # Split by pipe delimiter
-            fields = line.split('|')
-            
-            # Check if correct number of fields
-            if len(fields) != 8:
-                skipped += 1
-                continue
-            
-            # Extract fields
-            transaction_id = fields[0].strip()
-            date = fields[1].strip()
-            product_id = fields[2].strip()
-            product_name = fields[3].strip()
-            quantity_str = fields[4].strip()
-            unit_price_str = fields[5].strip()
-            customer_id = fields[6].strip()
-            region = fields[7].strip()
-            
-            # Clean ProductName: remove commas
-            product_name = product_name.replace(',', ' ').strip()
-            
-            # Clean numeric fields: remove commas
-            quantity_str = quantity_str.replace(',', '')
-            unit_price_str = unit_price_str.replace(',', '')
-            
-            # Convert to proper types
-            quantity = int(quantity_str)
-            unit_price = float(unit_price_str)
-            
-            # Create transaction dictionary
-            transaction = {
-                'TransactionID': transaction_id,
-                'Date': date,
-                'ProductID': product_id,
-                'ProductName': product_name,
-                'Quantity': quantity,
-                'UnitPrice': unit_price,
-                'CustomerID': customer_id,
-                'Region': region
-            }
-            
-            transactions.append(transaction)
-        
-        except (ValueError, IndexError):
-            skipped += 1
-            continue
-    
-    if skipped > 0:
-        print(f"⚠ Skipped {skipped} rows due to parsing errors")
-    
-    print(f"✓ Parsed {len(transactions)} transactions successfully")
-    return transactions
-
-def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None):
-    """
-    Validates transactions and applies optional filters
-    
-    Parameters:
-    - transactions: list of transaction dictionaries
-    - region: filter by specific region (optional)
-    - min_amount: minimum transaction amount (Quantity * UnitPrice) (optional)
-    - max_amount: maximum transaction amount (optional)
-    
-    Returns: tuple (valid_transactions, invalid_count, filter_summary)
-    
-    Expected Output Format:
-    (
-        [list of valid filtered transactions],
-        5,  # count of invalid transactions
-        {
-            'total_input': 100,
-            'invalid': 5,
-            'filtered_by_region': 20,
-            'filtered_by_amount': 10,
-            'final_count': 65
-        }
-    )
-    
-    Validation Rules:
-    - Quantity must be > 0
-    - UnitPrice must be > 0
-    - All required fields must be present
-    - TransactionID must start with 'T'
-    - ProductID must start with 'P'
-    - CustomerID must start with 'C'
-    """
-    
-    valid_transactions = []
-    invalid_count = 0
-    
-    # Step 1: Validate records
-    print("\n" + "="*50)
-    print("VALIDATING TRANSACTIONS")
-    print("="*50)
-    
-    for trans in transactions:
-        is_valid = True
-        
-        # Check Quantity > 0
-        if trans['Quantity'] <= 0:
-            is_valid = False
-        
-        # Check UnitPrice > 0
-        if trans['UnitPrice'] <= 0:
-            is_valid = False
-        
-        # Check required fields
-        if not trans.get('CustomerID') or not trans.get('Region'):
-            is_valid = False
-        
-        # Check TransactionID starts with 'T'
-        if not trans['TransactionID'].startswith('T'):
-            is_valid = False
-        
-        # Check ProductID starts with 'P'
-        if not trans['ProductID'].startswith('P'):
-            is_valid = False
-        
-        # Check CustomerID starts with 'C'
-        if not trans['CustomerID'].startswith('C'):
-            is_valid = False
-        
-        if is_valid:
-            valid_transactions.append(trans)
-        else:
-            invalid_count += 1
-    
-    print(f"✓ Total input: {len(transactions)}")
-    print(f"✗ Invalid: {invalid_count}")
-    print(f"✓ Valid: {len(valid_transactions)}")
-    
-    # Step 2: Display available filter options
-    print("\n" + "="*50)
-    print("FILTER OPTIONS")
-    print("="*50)
-    
-    # Get unique regions
-    regions = sorted(set(trans['Region'] for trans in valid_transactions))
-    print(f"Available regions: {', '.join(regions)}")
-    
-    # Calculate amount range
-    amounts = [trans['Quantity'] * trans['UnitPrice'] for trans in valid_transactions]
-    min_trans_amount = min(amounts) if amounts else 0
-    max_trans_amount = max(amounts) if amounts else 0
-    print(f"Transaction amount range: ₹{min_trans_amount:,} - ₹{max_trans_amount:,}")
-    
-    # Step 3: Apply filters
-    filtered_transactions = valid_transactions.copy()
-    filtered_by_region = 0
-    filtered_by_amount = 0
-    
-    if region:
-        filtered_transactions = [t for t in filtered_transactions if t['Region'] == region]
-        filtered_by_region = len(valid_transactions) - len(filtered_transactions)
-    
-    if min_amount or max_amount:
-        initial_count = len(filtered_transactions)
-        
-        filtered_transactions = [
-            t for t in filtered_transactions 
-            if (min_amount is None or (t['Quantity'] * t['UnitPrice']) >= min_amount) and
-               (max_amount is None or (t['Quantity'] * t['UnitPrice']) <= max_amount)
-        ]
-        
-        filtered_by_amount = initial_count - len(filtered_transactions)
-    
-    # Step 4: Create summary
-    filter_summary = {
-        'total_input': len(transactions),
-        'invalid': invalid_count,
-        'valid': len(valid_transactions),
-        'filtered_by_region': filtered_by_region,
-        'filtered_by_amount': filtered_by_amount,
-        'final_count': len(filtered_transactions)
-    }
-    
-    print(f"\n✓ Final count after filtering: {filter_summary['final_count']}")
-    
-    return (filtered_transactions, invalid_count, filter_summary)
-
-def calculate_total_revenue(transactions):
-    """
-    Calculates total revenue from all transactions
-    
-    Returns: float (total revenue)
-    
-    Expected Output: Single number representing sum of (Quantity * UnitPrice)
-    Example: 1545000.50
-    """
-    total = 0
-    for trans in transactions:
-        total += trans['Quantity'] * trans['UnitPrice']
-    
-    return total
-
-def region_wise_sales(transactions):
-    """
-    Analyzes sales by region
-    
-    Returns: dictionary with region statistics
-    
-    Expected Output Format:
-    {
-        'North': {
-            'total_sales': 450000.0,
-            'transaction_count': 15,
-            'percentage': 29.13
-        },
-        'South': {...},
-        ...
-    }
-    """
-    region_data = {}
-    total_revenue = calculate_total_revenue(transactions)
-    
-    # Group by region
-    for trans in transactions:
-        region = trans['Region']
-        amount = trans['Quantity'] * trans['UnitPrice']
-        
-        if region not in region_data:
-            region_data[region] = {
-                'total_sales': 0,
-                'transaction_count': 0
-            }
-        
-        region_data[region]['total_sales'] += amount
-        region_data[region]['transaction_count'] += 1
-    
-    # Calculate percentages and sort
-    for region in region_data:
-        percentage = (region_data[region]['total_sales'] / total_revenue * 100) if total_revenue > 0 else 0
-        region_data[region]['percentage'] = round(percentage, 2)
-    
-    # Sort by total_sales descending
-    sorted_regions = dict(sorted(region_data.items(), key=lambda x: x[1]['total_sales'], reverse=True))
-    
-    return sorted_regions
-
-def top_selling_products(transactions, n=5):
-    """
-    Finds top n products by total quantity sold
-    
-    Returns: list of tuples
-    [
-        ('Laptop', 45, 2250000.0),  # (ProductName, TotalQuantity, TotalRevenue)
-        ('Mouse', 38, 19000.0),
-        ...
-    ]
-    """
-    product_data = {}
-    
-    # Aggregate by product
-    for trans in transactions:
-        product = trans['ProductName']
-        quantity = trans['Quantity']
-        amount = quantity * trans['UnitPrice']
-        
-        if product not in product_data:
-            product_data[product] = {
-                'total_quantity': 0,
-                'total_revenue': 0
-            }
-        
-        product_data[product]['total_quantity'] += quantity
-        product_data[product]['total_revenue'] += amount
-    
-    # Convert to list of tuples and sort
-    products_list = [
-        (name, data['total_quantity'], data['total_revenue'])
-        for name, data in product_data.items()
-    ]
-    
-    # Sort by quantity descending
-    products_list.sort(key=lambda x: x[1], reverse=True)
-    
-    return products_list[:n]
-
-def customer_analysis(transactions):
-    """
-    Analyzes customer purchase patterns
-    
-    Returns: dictionary of customer statistics
-    
-    Expected Output Format:
-    {
-        'C001': {
-            'total_spent': 95000.0,
-            'purchase_count': 3,
-            'avg_order_value': 31666.67,
-            'products_bought': ['Laptop', 'Mouse', 'Keyboard']
-        },
-        'C002': {...},
-        ...
-    }
-    """
-    customer_data = {}
-    
-    # Aggregate by customer
-    for trans in transactions:
-        customer = trans['CustomerID']
-        amount = trans['Quantity'] * trans['UnitPrice']
-        product = trans['ProductName']
-        
-        if customer not in customer_data:
-            customer_data[customer] = {
-                'total_spent': 0,
-                'purchase_count': 0,
-                'products': set()
-            }
-        
-        customer_data[customer]['total_spent'] += amount
-        customer_data[customer]['purchase_count'] += 1
-        customer_data[customer]['products'].add(product)
-    
-    # Calculate averages and format
-    for customer in customer_data:
-        data = customer_data[customer]
-        data['avg_order_value'] = round(data['total_spent'] / data['purchase_count'], 2)
-        data['products_bought'] = sorted(list(data['products']))
-        del data['products']  # Remove temporary set
-    
-    # Sort by total_spent descending
-    sorted_customers = dict(sorted(customer_data.items(), key=lambda x: x[1]['total_spent'], reverse=True))
-    
-    return sorted_customers
-
-def daily_sales_trend(transactions):
-    """
-    Analyzes sales trends by date
-    
-    Returns: dictionary sorted by date
-    
-    Expected Output Format:
-    {
-        '2024-12-01': {
-            'revenue': 125000.0,
-            'transaction_count': 8,
-            'unique_customers': 6
-        },
-        '2024-12-02': {...},
-        ...
-    }
-    """
-    daily_data = {}
-    
-    # Group by date
-    for trans in transactions:
-        date = trans['Date']
-        amount = trans['Quantity'] * trans['UnitPrice']
-        customer = trans['CustomerID']
-        
-        if date not in daily_data:
-            daily_data[date] = {
-                'revenue': 0,
-                'transaction_count': 0,
-                'customers': set()
-            }
-        
-        daily_data[date]['revenue'] += amount
-        daily_data[date]['transaction_count'] += 1
-        daily_data[date]['customers'].add(customer)
-    
-    # Convert set to count and format
-    for date in daily_data:
-        data = daily_data[date]
-        data['unique_customers'] = len(data['customers'])
-        del data['customers']  # Remove temporary set
-    
-    # Sort chronologically
-    sorted_daily = dict(sorted(daily_data.items()))
-    
-    return sorted_daily
-
-from datetime import datetime
-
-def generate_sales_report(transactions, enriched_transactions, output_file='output/sales_report.txt'):
-    """
-    Generates a comprehensive formatted text report
-    
-    Parameters:
-    - transactions: list of transaction dictionaries
-    - enriched_transactions: list of enriched transaction dictionaries
-    - output_file: path to save the report
-    """
-    
-    try:
-        # 1. HEADER
-        report = []
-        report.append("=" * 50)
-        report.append("SALES ANALYTICS REPORT")
-        report.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append(f"Records Processed: {len(transactions)}")
-        report.append("=" * 50)
-        report.append("")
-        
-        # 2. OVERALL SUMMARY
-        total_revenue = sum(t['Quantity'] * t['UnitPrice'] for t in transactions)
-        total_transactions = len(transactions)
-        avg_order_value = total_revenue / total_transactions if total_transactions > 0 else 0
-        
-        # Get date range
-        dates = [t['Date'] for t in transactions]
-        min_date = min(dates) if dates else "N/A"
-        max_date = max(dates) if dates else "N/A"
-        
-        report.append("OVERALL SUMMARY")
-        report.append("-" * 50)
-        report.append(f"Total Revenue: ₹{total_revenue:,.2f}")
-        report.append(f"Total Transactions: {total_transactions}")
-        report.append(f"Average Order Value: ₹{avg_order_value:,.2f}")
-        report.append(f"Date Range: {min_date} to {max_date}")
-        report.append("")
-        
-        # 3. REGION-WISE PERFORMANCE
-        region_stats = {}
-        for t in transactions:
-            region = t['Region']
-            if region not in region_stats:
-                region_stats[region] = {'sales': 0, 'count': 0}
-            region_stats[region]['sales'] += t['Quantity'] * t['UnitPrice']
-            region_stats[region]['count'] += 1
-        
-        # Sort by sales descending
-        sorted_regions = sorted(region_stats.items(), key=lambda x: x[1]['sales'], reverse=True)
-        
-        report.append("REGION-WISE PERFORMANCE")
-        report.append("-" * 50)
-        report.append(f"{'Region':<15} {'Sales':<20} {'% of Total':<15} {'Transactions':<15}")
-        report.append("-" * 50)
-        
-        for region, stats in sorted_regions:
-            percentage = (stats['sales'] / total_revenue * 100) if total_revenue > 0 else 0
-            report.append(f"{region:<15} ₹{stats['sales']:>15,.2f}  {percentage:>8.2f}%  {stats['count']:>10}")
-        
-        report.append("")
-        
-        # 4. TOP 5 PRODUCTS
-        product_stats = {}
-        for t in transactions:
-            product = t['ProductName']
-            if product not in product_stats:
-                product_stats[product] = {'qty': 0, 'revenue': 0}
-            product_stats[product]['qty'] += t['Quantity']
-            product_stats[product]['revenue'] += t['Quantity'] * t['UnitPrice']
-        
-        top_5_products = sorted(product_stats.items(), key=lambda x: x[1]['qty'], reverse=True)[:5]
-        
-        report.append("TOP 5 PRODUCTS")
-        report.append("-" * 50)
-        report.append(f"{'Rank':<6} {'Product Name':<25} {'Quantity':<12} {'Revenue':<15}")
-        report.append("-" * 50)
-        
-        for idx, (product, stats) in enumerate(top_5_products, 1):
-            report.append(f"{idx:<6} {product:<25} {stats['qty']:<12} ₹{stats['revenue']:>12,.2f}")
-        
-        report.append("")
-        
-        # 5. TOP 5 CUSTOMERS
-        customer_stats = {}
-        for t in transactions:
-            cust_id = t['CustomerID']
-            if cust_id not in customer_stats:
-                customer_stats[cust_id] = {'spent': 0, 'count': 0}
-            customer_stats[cust_id]['spent'] += t['Quantity'] * t['UnitPrice']
-            customer_stats[cust_id]['count'] += 1
-        
-        top_5_customers = sorted(customer_stats.items(), key=lambda x: x[1]['spent'], reverse=True)[:5]
-        
-        report.append("TOP 5 CUSTOMERS")
-        report.append("-" * 50)
-        report.append(f"{'Rank':<6} {'Customer ID':<15} {'Total Spent':<20} {'Orders':<10}")
-        report.append("-" * 50)
-        
-        for idx, (cust_id, stats) in enumerate(top_5_customers, 1):
-            report.append(f"{idx:<6} {cust_id:<15} ₹{stats['spent']:>15,.2f}  {stats['count']:>8}")
-        
-        report.append("")
-        
-        # 6. DAILY SALES TREND
-        daily_stats = {}
-        for t in transactions:
-            date = t['Date']
-            if date not in daily_stats:
-                daily_stats[date] = {'revenue': 0, 'count': 0, 'customers': set()}
-            daily_stats[date]['revenue'] += t['Quantity'] * t['UnitPrice']
-            daily_stats[date]['count'] += 1
-            daily_stats[date]['customers'].add(t['CustomerID'])
-        
-        sorted_dates = sorted(daily_stats.items())
-        
-        report.append("DAILY SALES TREND")
-        report.append("-" * 50)
-        report.append(f"{'Date':<15} {'Revenue':<20} {'Transactions':<15} {'Unique Customers':<15}")
-        report.append("-" * 50)
-        
-        for date, stats in sorted_dates:
-            report.append(f"{date:<15} ₹{stats['revenue']:>15,.2f}  {stats['count']:>12}  {len(stats['customers']):>15}")
-        
-        report.append("")
-        
-        # 7. PRODUCT PERFORMANCE ANALYSIS
-        report.append("PRODUCT PERFORMANCE ANALYSIS")
-        report.append("-" * 50)
-        
-        # Best selling day
-        best_day = max(daily_stats.items(), key=lambda x: x[1]['revenue'])
-        report.append(f"Best Selling Day: {best_day[0]} (₹{best_day[1]['revenue']:,.2f})")
-        
-        # Low performing products (threshold = 10)
-        low_performers = {p: stats for p, stats in product_stats.items() if stats['qty'] < 10}
-        if low_performers:
-            report.append("\nLow Performing Products (< 10 units sold):")
-            for product, stats in sorted(low_performers.items(), key=lambda x: x[1]['qty']):
-                report.append(f"  - {product}: {stats['qty']} units (₹{stats['revenue']:,.2f})")
-        else:
-            report.append("Low Performing Products: None")
-        
-        # Average transaction value per region
-        report.append("\nAverage Transaction Value per Region:")
-        for region, stats in sorted_regions:
-            avg = stats['sales'] / stats['count'] if stats['count'] > 0 else 0
-            report.append(f"  - {region}: ₹{avg:,.2f}")
-        
-        report.append("")
-        
-        # 8. API ENRICHMENT SUMMARY
-        enriched_count = sum(1 for t in enriched_transactions if t.get('API_Match', False))
-        total_enriched = len(enriched_transactions)
-        success_rate = (enriched_count / total_enriched * 100) if total_enriched > 0 else 0
-        
-        report.append("API ENRICHMENT SUMMARY")
-        report.append("-" * 50)
-        report.append(f"Total Products Enriched: {enriched_count}/{total_enriched}")
-        report.append(f"Success Rate: {success_rate:.2f}%")
-        
-        # Products that couldn't be enriched
-        failed_products = set()
-        for t in enriched_transactions:
-            if not t.get('API_Match', False):
-                failed_products.add(t.get('ProductID', 'Unknown'))
-        
-        if failed_products:
-            report.append(f"Products Not Enriched: {', '.join(sorted(failed_products))}")
-        else:
-            report.append("Products Not Enriched: None")
-        
-        report.append("")
-        report.append("=" * 50)
-        report.append("END OF REPORT")
-        report.append("=" * 50)
-        
-        # Write to file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(report))
-        
-        print(f"✓ Report saved to: {output_file}")
-        return True
-        
-    except Exception as e:
-        print(f"Error generating report: {str(e)}")
-        return False
-
-def daily_sales_trend(transactions):
-    """
-    Analyzes sales trends by date
-    
-    Returns: dictionary sorted by date
-    """
-    daily_stats = {}
-    for t in transactions:
-        date = t['Date']
-        if date not in daily_stats:
-            daily_stats[date] = {'revenue': 0, 'count': 0, 'customers': set()}
-        daily_stats[date]['revenue'] += t['Quantity'] * t['UnitPrice']
-        daily_stats[date]['count'] += 1
-        daily_stats[date]['customers'].add(t['CustomerID'])
-    
-    # Convert sets to lists for JSON serialization
-    result = {}
-    for date in sorted(daily_stats.keys()):
-        result[date] = {
-            'revenue': daily_stats[date]['revenue'],
-            'transaction_count': daily_stats[date]['count'],
-            'unique_customers': len(daily_stats[date]['customers'])
-        }
-    
-    return result
-
-
-def find_peak_sales_day(transactions):
-    """
-    Identifies the date with highest revenue
-    
-    Returns: tuple (date, revenue, transaction_count)
-    """
-    if not transactions:
-        return None, 0, 0
-    
-    daily_stats = {}
-    for t in transactions:
-        date = t['Date']
-        if date not in daily_stats:
-            daily_stats[date] = {'revenue': 0, 'count': 0}
-        daily_stats[date]['revenue'] += t['Quantity'] * t['UnitPrice']
-        daily_stats[date]['count'] += 1
-    
-    # Find peak day
-    peak_date = max(daily_stats.items(), key=lambda x: x[1]['revenue'])
-    return (peak_date[0], peak_date[1]['revenue'], peak_date[1]['count'])
-
-
-def low_performing_products(transactions, threshold=10):
-    """
-    Identifies products with low sales
-    
-    Returns: list of tuples (ProductName, TotalQuantity, TotalRevenue)
-    """
-    product_stats = {}
-    for t in transactions:
-        product = t['ProductName']
-        if product not in product_stats:
-            product_stats[product] = {'qty': 0, 'revenue': 0}
-        product_stats[product]['qty'] += t['Quantity']
-        product_stats[product]['revenue'] += t['Quantity'] * t['UnitPrice']
-    
-    # Find low performers
-    low_performers = [
-        (name, stats['qty'], stats['revenue'])
-        for name, stats in product_stats.items()
-        if stats['qty'] < threshold
-    ]
-    
-    # Sort by quantity ascending
-    return sorted(low_performers, key=lambda x: x[1])
+import csv
+import heapq
+import io
+from collections import defaultdict
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+_COLUMNS = ['TransactionID', 'Date', 'ProductID', 'ProductName',
+            'Quantity', 'UnitPrice', 'CustomerID', 'Region']
+
+# Below this many lines, the plain Python row loop beats the pandas
+# parser's fixed startup cost
+VECTOR_PARSE_MIN_LINES = 1_000
+
+# Translation tables for comma cleanup — one C-level pass per field
+# instead of chained str.replace calls
+_COMMA_TO_SPACE = str.maketrans(',', ' ')
+_STRIP_COMMAS = str.maketrans('', '', ',')
+
+# Required ID prefixes checked during validation
+_ID_PREFIXES = (('TransactionID', 'T'), ('ProductID', 'P'), ('CustomerID', 'C'))
+
+
+def _parse_lines_vector(raw_lines):
+    """Parses raw lines through the pandas C parser
+
+    Returns: (transactions, skipped) — same results as _parse_rows, but
+    every column is cleaned and converted in vectorized passes instead
+    of per-row Python string work.
+    """
+    lines = pd.Series(raw_lines, dtype=str)
+
+    # Same arity rule as the row loop: exactly 8 pipe-separated fields
+    arity_ok = lines.str.count(r'\|').eq(len(_COLUMNS) - 1)
+
+    # QUOTE_NONE: fields are taken verbatim like line.split('|') — the
+    # default quote handling would strip double quotes the row loop keeps
+    df = pd.read_csv(io.StringIO('\n'.join(lines[arity_ok])),
+                     sep='|', header=None, names=_COLUMNS,
+                     dtype=str, keep_default_na=False, engine='c',
+                     quoting=csv.QUOTE_NONE)
+
+    for col in _COLUMNS:
+        df[col] = df[col].str.strip()
+
+    # Clean ProductName: remove commas
+    df['ProductName'] = df['ProductName'].str.replace(',', ' ', regex=False).str.strip()
+
+    # Clean numeric fields: remove commas, then convert; rows that fail
+    # conversion are dropped just like the row loop's ValueError path.
+    # Quantity must be a plain signed digit run — int() semantics — so
+    # '2.0' or '1e3' are rejected exactly like the row loop does
+    quantity_str = df['Quantity'].str.replace(',', '', regex=False)
+    quantity_ok = quantity_str.str.fullmatch(r'\s*[+-]?\d+\s*')
+    quantity = pd.to_numeric(quantity_str.where(quantity_ok), errors='coerce')
+    unit_price = pd.to_numeric(df['UnitPrice'].str.replace(',', '', regex=False), errors='coerce')
+    numeric_ok = quantity.notna() & unit_price.notna()
+
+    df = df[numeric_ok]
+    df['Quantity'] = quantity[numeric_ok].astype('int64')
+    df['UnitPrice'] = unit_price[numeric_ok].astype('float64')
+
+    # Precompute the transaction amount once; every downstream
+    # analysis reuses it instead of re-multiplying per row
+    df['Amount'] = df['Quantity'] * df['UnitPrice']
+
+    transactions = df.to_dict('records')
+    return transactions, len(raw_lines) - len(transactions)
+
+
+def parse_transactions(raw_lines):
+    """
+    Parses raw lines into clean list of dictionaries
+
+    Returns: list of dictionaries with 9 keys:
+    ['TransactionID', 'Date', 'ProductID', 'ProductName',
+     'Quantity', 'UnitPrice', 'CustomerID', 'Region', 'Amount']
+
+    Expected Output Format:
+    [
+        {
+            'TransactionID': 'T001',
+            'Date': '2024-12-01',
+            'ProductID': 'P101',
+            'ProductName': 'Laptop',
+            'Quantity': 2,
+            'UnitPrice': 45000.0,
+            'CustomerID': 'C001',
+            'Region': 'North',
+            'Amount': 90000.0
+        },
+        ...
+    ]
+
+    Requirements:
+    - Split by pipe delimiter '|'
+    - Handle commas within ProductName (remove or replace)
+    - Remove commas from numeric fields and convert to proper types
+    - Convert Quantity to int
+    - Convert UnitPrice to float
+    - Skip rows with incorrect number of fields
+    """
+
+    if len(raw_lines) >= VECTOR_PARSE_MIN_LINES:
+        transactions, skipped = _parse_lines_vector(raw_lines)
+    else:
+        transactions, skipped = _parse_rows(raw_lines)
+
+    if skipped > 0:
+        print(f"⚠ Skipped {skipped} rows due to parsing errors")
+
+    print(f"✓ Parsed {len(transactions)} transactions successfully")
+    return transactions
+
+
+def _parse_rows(raw_lines):
+    """Plain Python row loop, used for small inputs
+
+    Returns: (transactions, skipped)
+    """
+    transactions = []
+    skipped = 0
+
+    for line in raw_lines:
+        try:
+            # Unpack the eight pipe-separated fields in one step; a wrong
+            # field count raises ValueError straight to the skip path
+            (transaction_id, date, product_id, product_name,
+             quantity_str, unit_price_str, customer_id, region) = line.split('|')
+
+            # Clean fields
+            transaction_id = transaction_id.strip()
+            date = date.strip()
+            product_id = product_id.strip()
+            customer_id = customer_id.strip()
+            region = region.strip()
+
+            # Clean ProductName: commas become spaces, then one strip
+            product_name = product_name.translate(_COMMA_TO_SPACE).strip()
+
+            # Numeric fields: drop commas; int()/float() tolerate the
+            # surrounding whitespace, so no strip needed first
+            quantity = int(quantity_str.translate(_STRIP_COMMAS))
+            unit_price = float(unit_price_str.translate(_STRIP_COMMAS))
+            
+            # Create transaction dictionary (Amount precomputed once,
+            # reused by every downstream analysis)
+            transaction = {
+                'TransactionID': transaction_id,
+                'Date': date,
+                'ProductID': product_id,
+                'ProductName': product_name,
+                'Quantity': quantity,
+                'UnitPrice': unit_price,
+                'CustomerID': customer_id,
+                'Region': region,
+                'Amount': quantity * unit_price
+            }
+            
+            transactions.append(transaction)
+        
+        except ValueError:
+            skipped += 1
+            continue
+
+    return transactions, skipped
+
+def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None):
+    """
+    Validates transactions and applies optional filters
+    
+    Parameters:
+    - transactions: list of transaction dictionaries
+    - region: filter by specific region (optional)
+    - min_amount: minimum transaction amount (Quantity * UnitPrice) (optional)
+    - max_amount: maximum transaction amount (optional)
+    
+    Returns: tuple (valid_transactions, invalid_count, filter_summary)
+    
+    Expected Output Format:
+    (
+        [list of valid filtered transactions],
+        5,  # count of invalid transactions
+        {
+            'total_input': 100,
+            'invalid': 5,
+            'filtered_by_region': 20,
+            'filtered_by_amount': 10,
+            'final_count': 65
+        }
+    )
+    
+    Validation Rules:
+    - Quantity must be > 0
+    - UnitPrice must be > 0
+    - All required fields must be present
+    - TransactionID must start with 'T'
+    - ProductID must start with 'P'
+    - CustomerID must start with 'C'
+    """
+    
+    # Step 1: Validate records — all six rules combine into a single
+    # boolean mask computed column-wise
+    print("\n" + "="*50)
+    print("VALIDATING TRANSACTIONS")
+    print("="*50)
+
+    df = _as_frame(transactions)
+
+    if df.empty:
+        valid_df = df
+        invalid_count = 0
+    else:
+        valid = (
+            (df['Quantity'] > 0)
+            & (df['UnitPrice'] > 0)
+            & df['CustomerID'].ne('')        # required fields present
+            & df['Region'].ne('')
+        )
+        for column, prefix in _ID_PREFIXES:
+            valid &= df[column].str.startswith(prefix)
+        valid = valid.to_numpy()
+        invalid_count = int(np.count_nonzero(~valid))
+        # Skip the boolean-indexing copy when every row passed
+        valid_df = df if invalid_count == 0 else df[valid]
+
+    # Returned records always carry Amount; attach it when the caller
+    # passed the bare 8-key shape
+    if not valid_df.empty and 'Amount' not in valid_df.columns:
+        valid_df = valid_df.assign(Amount=_amount(valid_df))
+
+    valid_transactions = valid_df.to_dict('records')
+
+    print(f"✓ Total input: {len(transactions)}")
+    print(f"✗ Invalid: {invalid_count}")
+    print(f"✓ Valid: {len(valid_transactions)}")
+
+    # Step 2: Display available filter options
+    print("\n" + "="*50)
+    print("FILTER OPTIONS")
+    print("="*50)
+
+    # Get unique regions
+    regions = sorted(valid_df['Region'].unique()) if not valid_df.empty else []
+    print(f"Available regions: {', '.join(regions)}")
+
+    # Calculate amount range
+    amounts = _amount(valid_df) if not valid_df.empty else None
+    min_trans_amount = float(amounts.min()) if amounts is not None else 0
+    max_trans_amount = float(amounts.max()) if amounts is not None else 0
+    print(f"Transaction amount range: ₹{min_trans_amount:,} - ₹{max_trans_amount:,}")
+    
+    # Step 3: Apply filters
+    filtered_transactions = valid_transactions.copy()
+    filtered_by_region = 0
+    filtered_by_amount = 0
+    
+    if region:
+        filtered_transactions = [t for t in filtered_transactions if t['Region'] == region]
+        filtered_by_region = len(valid_transactions) - len(filtered_transactions)
+    
+    if min_amount or max_amount:
+        initial_count = len(filtered_transactions)
+        
+        filtered_transactions = [
+            t for t in filtered_transactions 
+            if (min_amount is None or t['Amount'] >= min_amount) and
+               (max_amount is None or t['Amount'] <= max_amount)
+        ]
+        
+        filtered_by_amount = initial_count - len(filtered_transactions)
+    
+    # Step 4: Create summary
+    filter_summary = {
+        'total_input': len(transactions),
+        'invalid': invalid_count,
+        'valid': len(valid_transactions),
+        'filtered_by_region': filtered_by_region,
+        'filtered_by_amount': filtered_by_amount,
+        'final_count': len(filtered_transactions)
+    }
+    
+    print(f"\n✓ Final count after filtering: {filter_summary['final_count']}")
+    
+    return (filtered_transactions, invalid_count, filter_summary)
+
+# Low-cardinality string columns stored as categoricals: groupby runs on
+# the integer codes and each distinct string is kept once
+_CATEGORY_COLUMNS = ('Region', 'ProductID', 'ProductName', 'CustomerID')
+
+
+def _as_frame(transactions):
+    """Returns transactions as a DataFrame (no copy if already one)"""
+    if isinstance(transactions, pd.DataFrame):
+        return transactions
+    df = pd.DataFrame(transactions)
+    for column in _CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    return df
+
+
+def _amount(df):
+    """Per-transaction amounts; reuses the column precomputed at parse"""
+    if 'Amount' in df.columns:
+        return df['Amount']
+    return df['Quantity'] * df['UnitPrice']
+
+def calculate_total_revenue(transactions):
+    """
+    Calculates total revenue from all transactions
+
+    Returns: float (total revenue)
+
+    Expected Output: Single number representing sum of (Quantity * UnitPrice)
+    Example: 1545000.50
+    """
+    df = _as_frame(transactions)
+    if df.empty:
+        return 0
+
+    return float(_amount(df).sum())
+
+def region_wise_sales(transactions):
+    """
+    Analyzes sales by region
+
+    Returns: list of (region, stats) tuples sorted by total_sales descending
+
+    Expected Output Format:
+    [
+        ('North', {
+            'total_sales': 450000.0,
+            'transaction_count': 15,
+            'percentage': 29.13
+        }),
+        ('South', {...}),
+        ...
+    ]
+    """
+    df = _as_frame(transactions)
+    if df.empty:
+        return []
+
+    amount = _amount(df)
+
+    # Group by region — one columnar pass per aggregate
+    region_data = pd.DataFrame({
+        'total_sales': amount.groupby(df['Region'], sort=False, observed=True).sum(),
+        'transaction_count': df.groupby('Region', sort=False, observed=True).size()
+    })
+
+    # Overall revenue falls out of the per-region sums — no extra
+    # full-column pass needed
+    total_revenue = float(region_data['total_sales'].sum())
+
+    # Calculate percentages and sort by total_sales descending
+    if total_revenue > 0:
+        region_data['percentage'] = (region_data['total_sales'] / total_revenue * 100).round(2)
+    else:
+        region_data['percentage'] = 0.0
+    region_data = region_data.sort_values('total_sales', ascending=False, kind='stable')
+
+    # Hand back (region, stats) pairs directly — no dict rebuild at the
+    # return boundary
+    return [(region, {'total_sales': float(total_sales),
+                      'transaction_count': int(count),
+                      'percentage': float(percentage)})
+            for region, total_sales, count, percentage in region_data.itertuples()]
+
+def top_selling_products(transactions, n=5):
+    """
+    Finds top n products by total quantity sold
+
+    Returns: list of tuples
+    [
+        ('Laptop', 45, 2250000.0),  # (ProductName, TotalQuantity, TotalRevenue)
+        ('Mouse', 38, 19000.0),
+        ...
+    ]
+    """
+    df = _as_frame(transactions)
+    if df.empty:
+        return []
+
+    amount = _amount(df)
+
+    # Aggregate by product
+    product_data = pd.DataFrame({
+        'total_quantity': df.groupby('ProductName', sort=False, observed=True)['Quantity'].sum(),
+        'total_revenue': amount.groupby(df['ProductName'], sort=False, observed=True).sum()
+    })
+
+    # Top n by quantity — partial selection, no full sort
+    product_data = product_data.nlargest(n, 'total_quantity')
+
+    return [(name, int(qty), float(revenue))
+            for name, qty, revenue in product_data.itertuples()]
+
+def customer_analysis(transactions):
+    """
+    Analyzes customer purchase patterns
+
+    Returns: list of (customer, stats) tuples sorted by total_spent descending
+
+    Expected Output Format:
+    [
+        ('C001', {
+            'total_spent': 95000.0,
+            'purchase_count': 3,
+            'avg_order_value': 31666.67,
+            'products_bought': ['Laptop', 'Mouse', 'Keyboard']
+        }),
+        ('C002', {...}),
+        ...
+    ]
+    """
+    df = _as_frame(transactions)
+    if df.empty:
+        return []
+
+    amount = _amount(df)
+    grouped = df.groupby('CustomerID', sort=False, observed=True)
+
+    # Aggregate by customer
+    customer_data = pd.DataFrame({
+        'total_spent': amount.groupby(df['CustomerID'], sort=False, observed=True).sum(),
+        'purchase_count': grouped.size(),
+        # object view for the agg: categorical columns cannot hold the
+        # per-group lists this produces
+        'products_bought': df['ProductName'].astype(object)
+                           .groupby(df['CustomerID'], sort=False, observed=True)
+                           .agg(lambda products: sorted(products.unique()))
+    })
+
+    customer_data['avg_order_value'] = (customer_data['total_spent'] / customer_data['purchase_count']).round(2)
+
+    # Sort by total_spent descending, with the original key order
+    customer_data = customer_data[['total_spent', 'purchase_count', 'avg_order_value', 'products_bought']]
+    customer_data = customer_data.sort_values('total_spent', ascending=False, kind='stable')
+
+    return [(customer, {'total_spent': float(spent),
+                        'purchase_count': int(count),
+                        'avg_order_value': float(avg),
+                        'products_bought': products})
+            for customer, spent, count, avg, products in customer_data.itertuples()]
+
+from datetime import datetime
+
+def generate_sales_report(transactions, api_summary, output_file='output/sales_report.txt'):
+    """
+    Generates a comprehensive formatted text report
+
+    Parameters:
+    - transactions: list of transaction dictionaries
+    - api_summary: enrichment summary from enrich_and_save_chunks()
+      with 'matched', 'total' and 'failed_products' keys
+    - output_file: path to save the report
+    """
+    
+    try:
+        # 1. HEADER
+        # Lines go straight into one string buffer; the file is written
+        # in a single call at the end
+        buf = io.StringIO()
+
+        def line(text=''):
+            buf.write(text)
+            buf.write('\n')
+
+        banner = "=" * 50
+        rule = "-" * 50
+
+        line(banner)
+        line("SALES ANALYTICS REPORT")
+        line(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        line(f"Records Processed: {len(transactions)}")
+        line(banner)
+        line()
+        
+        # 2. OVERALL SUMMARY
+        # All per-row statistics are accumulated in one fused pass so each
+        # record is touched exactly once instead of once per section.
+        # defaultdict list slots skip the membership test and inner-dict
+        # hashing per row — slot layouts:
+        #   region   [sales, count]      product [qty, revenue]
+        #   customer [spent, count]      daily   [revenue, count, customers]
+        region_stats = defaultdict(lambda: [0.0, 0])
+        product_stats = defaultdict(lambda: [0, 0.0])
+        customer_stats = defaultdict(lambda: [0.0, 0])
+        daily_stats = defaultdict(lambda: [0.0, 0, set()])
+
+        for t in transactions:
+            # Amount is precomputed at parse; derive it for bare records
+            amount = t.get('Amount')
+            if amount is None:
+                amount = t['Quantity'] * t['UnitPrice']
+
+            r = region_stats[t['Region']]
+            r[0] += amount
+            r[1] += 1
+
+            p = product_stats[t['ProductName']]
+            p[0] += t['Quantity']
+            p[1] += amount
+
+            cust_id = t['CustomerID']
+            c = customer_stats[cust_id]
+            c[0] += amount
+            c[1] += 1
+
+            d = daily_stats[t['Date']]
+            d[0] += amount
+            d[1] += 1
+            d[2].add(cust_id)
+
+        # Totals fall out of the aggregates — no extra scans needed
+        total_revenue = sum(stats[0] for stats in region_stats.values())
+        total_transactions = len(transactions)
+        avg_order_value = total_revenue / total_transactions if total_transactions > 0 else 0
+
+        min_date = min(daily_stats) if daily_stats else "N/A"
+        max_date = max(daily_stats) if daily_stats else "N/A"
+
+        line("OVERALL SUMMARY")
+        line(rule)
+        line(f"Total Revenue: ₹{total_revenue:,.2f}")
+        line(f"Total Transactions: {total_transactions}")
+        line(f"Average Order Value: ₹{avg_order_value:,.2f}")
+        line(f"Date Range: {min_date} to {max_date}")
+        line()
+        
+        # 3. REGION-WISE PERFORMANCE
+        # Sort by sales descending; itemgetter keys avoid a Python-level
+        # lambda call per comparison
+        sorted_regions = sorted(((stats[0], region, stats[1])
+                                 for region, stats in region_stats.items()),
+                                key=itemgetter(0), reverse=True)
+        
+        line("REGION-WISE PERFORMANCE")
+        line(rule)
+        line(f"{'Region':<15} {'Sales':<20} {'% of Total':<15} {'Transactions':<15}")
+        line(rule)
+        
+        for sales, region, count in sorted_regions:
+            percentage = (sales / total_revenue * 100) if total_revenue > 0 else 0
+            line(f"{region:<15} ₹{sales:>15,.2f}  {percentage:>8.2f}%  {count:>10}")
+        
+        line()
+        
+        # 4. TOP 5 PRODUCTS
+        top_5_products = heapq.nlargest(5, ((stats[0], product, stats[1])
+                                            for product, stats in product_stats.items()),
+                                        key=itemgetter(0))
+        
+        line("TOP 5 PRODUCTS")
+        line(rule)
+        line(f"{'Rank':<6} {'Product Name':<25} {'Quantity':<12} {'Revenue':<15}")
+        line(rule)
+        
+        for idx, (qty, product, revenue) in enumerate(top_5_products, 1):
+            line(f"{idx:<6} {product:<25} {qty:<12} ₹{revenue:>12,.2f}")
+        
+        line()
+        
+        # 5. TOP 5 CUSTOMERS
+        top_5_customers = heapq.nlargest(5, ((stats[0], cust_id, stats[1])
+                                             for cust_id, stats in customer_stats.items()),
+                                         key=itemgetter(0))
+        
+        line("TOP 5 CUSTOMERS")
+        line(rule)
+        line(f"{'Rank':<6} {'Customer ID':<15} {'Total Spent':<20} {'Orders':<10}")
+        line(rule)
+        
+        for idx, (spent, cust_id, count) in enumerate(top_5_customers, 1):
+            line(f"{idx:<6} {cust_id:<15} ₹{spent:>15,.2f}  {count:>8}")
+        
+        line()
+        
+        # 6. DAILY SALES TREND
+        sorted_dates = sorted(daily_stats.items())
+        
+        line("DAILY SALES TREND")
+        line(rule)
+        line(f"{'Date':<15} {'Revenue':<20} {'Transactions':<15} {'Unique Customers':<15}")
+        line(rule)
+        
+        for date, stats in sorted_dates:
+            line(f"{date:<15} ₹{stats[0]:>15,.2f}  {stats[1]:>12}  {len(stats[2]):>15}")
+        
+        line()
+        
+        # 7. PRODUCT PERFORMANCE ANALYSIS
+        line("PRODUCT PERFORMANCE ANALYSIS")
+        line(rule)
+        
+        # Best selling day — one max over the already-aggregated daily
+        # revenues, no lambda per comparison
+        best_revenue, best_date = max(((stats[0], date)
+                                       for date, stats in daily_stats.items()),
+                                      key=itemgetter(0))
+        line(f"Best Selling Day: {best_date} (₹{best_revenue:,.2f})")
+        
+        # Low performing products (threshold = 10)
+        low_performers = [(stats[0], product, stats[1])
+                          for product, stats in product_stats.items() if stats[0] < 10]
+        if low_performers:
+            line("\nLow Performing Products (< 10 units sold):")
+            for qty, product, revenue in sorted(low_performers, key=itemgetter(0)):
+                line(f"  - {product}: {qty} units (₹{revenue:,.2f})")
+        else:
+            line("Low Performing Products: None")
+        
+        # Average transaction value per region
+        line("\nAverage Transaction Value per Region:")
+        for sales, region, count in sorted_regions:
+            avg = sales / count if count > 0 else 0
+            line(f"  - {region}: ₹{avg:,.2f}")
+        
+        line()
+        
+        # 8. API ENRICHMENT SUMMARY (accumulated during enrichment —
+        # no extra pass over the enriched data here)
+        enriched_count = api_summary.get('matched', 0)
+        total_enriched = api_summary.get('total', 0)
+        success_rate = (enriched_count / total_enriched * 100) if total_enriched > 0 else 0
+
+        line("API ENRICHMENT SUMMARY")
+        line(rule)
+        line(f"Total Products Enriched: {enriched_count}/{total_enriched}")
+        line(f"Success Rate: {success_rate:.2f}%")
+
+        failed_products = api_summary.get('failed_products', [])
+        if failed_products:
+            line(f"Products Not Enriched: {', '.join(failed_products)}")
+        else:
+            line("Products Not Enriched: None")
+        
+        line()
+        line(banner)
+        line("END OF REPORT")
+        line(banner)
+        
+        # Write to file in one call with a large buffer
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(buf.getvalue())
+        
+        print(f"✓ Report saved to: {output_file}")
+        return True
+        
+    except Exception as e:
+        print(f"Error generating report: {str(e)}")
+        return False
+
+def daily_sales_trend(transactions):
+    """
+    Analyzes sales trends by date
+
+    Returns: list of (date, stats) tuples in chronological order
+
+    Expected Output Format:
+    [
+        ('2024-12-01', {
+            'revenue': 125000.0,
+            'transaction_count': 8,
+            'unique_customers': 6
+        }),
+        ('2024-12-02', {...}),
+        ...
+    ]
+    """
+    df = _as_frame(transactions)
+    if df.empty:
+        return []
+
+    amount = _amount(df)
+    grouped = df.groupby('Date')  # sorted keys = chronological order
+
+    daily_stats = pd.DataFrame({
+        'revenue': amount.groupby(df['Date']).sum(),
+        'transaction_count': grouped.size(),
+        'unique_customers': grouped['CustomerID'].nunique()
+    })
+
+    return [(date, {'revenue': float(revenue),
+                    'transaction_count': int(count),
+                    'unique_customers': int(customers)})
+            for date, revenue, count, customers in daily_stats.itertuples()]
+
+
+def find_peak_sales_day(transactions):
+    """
+    Identifies the date with highest revenue
+
+    Returns: tuple (date, revenue, transaction_count)
+    """
+    df = _as_frame(transactions)
+    if df.empty:
+        return None, 0, 0
+
+    amount = _amount(df)
+    revenue = amount.groupby(df['Date']).sum()
+    counts = df.groupby('Date').size()
+
+    peak_date = revenue.idxmax()
+    return (peak_date, float(revenue[peak_date]), int(counts[peak_date]))
+
+
+def low_performing_products(transactions, threshold=10):
+    """
+    Identifies products with low sales
+
+    Returns: list of tuples (ProductName, TotalQuantity, TotalRevenue)
+    """
+    df = _as_frame(transactions)
+    if df.empty:
+        return []
+
+    amount = _amount(df)
+    quantities = df.groupby('ProductName', sort=False, observed=True)['Quantity'].sum()
+    revenues = amount.groupby(df['ProductName'], sort=False, observed=True).sum()
+
+    # Low performers, sorted by quantity ascending
+    low = quantities[quantities < threshold].sort_values(kind='stable')
+
+    return [(name, int(qty), float(revenues[name])) for name, qty in low.items()]
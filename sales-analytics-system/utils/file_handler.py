@@ -1,45 +1,66 @@
-def read_sales_data(filename):
-    """
-    Reads sales data from file handling encoding issues
-    
-    Returns: list of raw lines (strings)
-    
-    Expected Output Format:
-    ['T001|2024-12-01|P101|Laptop|2|45000|C001|North', ...]
-    
-    Requirements:
-    - Use 'with' statement
-    - Handle different encodings (try 'utf-8', 'latin-1', 'cp1252')
-    - Handle FileNotFoundError with appropriate error message
-    - Skip the header row
-    - Remove empty lines
-    """
-    
-    try:
-        # Try different encodings
-        encodings = ['utf-8', 'latin-1', 'cp1252']
-        
-        for encoding in encodings:
-            try:
-                with open(filename, 'r', encoding=encoding) as file:
-                    lines = file.readlines()
-                
-                # Remove empty lines and strip whitespace
-                lines = [line.strip() for line in lines if line.strip()]
-                
-                # Skip header row (first line)
-                if len(lines) > 0:
-                    lines = lines[1:]
-                
-                print(f"✓ Successfully read {len(lines)} transactions from {filename}")
-                return lines
-                
-            except UnicodeDecodeError:
-                continue
-        
-        print("Could not read file with any encoding")
-        return []
-    
-    except FileNotFoundError:
-        print(f"Error: File '{filename}' not found!")
-        return []
+def read_sales_data(filename):
+    """
+    Reads sales data from file handling encoding issues
+
+    Returns: list of raw lines (strings)
+
+    Expected Output Format:
+    ['T001|2024-12-01|P101|Laptop|2|45000|C001|North', ...]
+
+    Requirements:
+    - Use 'with' statement
+    - Detect encoding once from the BOM/bytes (utf-8, cp1252, latin-1)
+    - Handle FileNotFoundError with appropriate error message
+    - Skip the header row
+    - Remove empty lines
+    """
+
+    try:
+        # Read the bytes once; encoding detection works on the buffer
+        # instead of re-reading the file per candidate encoding
+        with open(filename, 'rb') as file:
+            raw = file.read()
+
+        # A BOM picks the encoding first, but bytes that merely look
+        # like a BOM must not crash the read — on decode failure fall
+        # through to the fallback chain (latin-1 accepts anything)
+        text = None
+
+        if raw.startswith(b'\xef\xbb\xbf'):
+            bom_encoding = 'utf-8-sig'
+        elif raw[:2] in (b'\xff\xfe', b'\xfe\xff'):
+            bom_encoding = 'utf-16'
+        else:
+            bom_encoding = None
+
+        if bom_encoding is not None:
+            try:
+                text = raw.decode(bom_encoding)
+            except UnicodeDecodeError:
+                text = None
+
+        if text is None:
+            for encoding in ('utf-8', 'cp1252', 'latin-1'):
+                try:
+                    text = raw.decode(encoding)
+                    break
+                except UnicodeDecodeError:
+                    continue
+            else:
+                print("Could not read file with any encoding")
+                return []
+
+        # Strip and drop empty lines in a single pass
+        lines = [stripped for line in text.splitlines()
+                 if (stripped := line.strip())]
+
+        # Skip header row (first line)
+        if len(lines) > 0:
+            lines = lines[1:]
+
+        print(f"✓ Successfully read {len(lines)} transactions from {filename}")
+        return lines
+
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found!")
+        return []